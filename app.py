@@ -1,10 +1,12 @@
 # app.py - Main Streamlit Application
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import datetime
 import sqlite3
+import threading
 import os
+from contextlib import contextmanager
 from pathlib import Path
 
 # Set page configuration
@@ -15,13 +17,20 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize database
-def init_db():
-    db_path = Path("project_management.db")
-    conn = sqlite3.connect(str(db_path))
+DB_PATH = Path("project_management.db")
+
+# Select options and their value -> index lookups
+PROJECT_STATUS_OPTIONS = ("Planning", "In Progress", "On Hold", "Completed", "Cancelled")
+PROJECT_STATUS_INDEX = {v: i for i, v in enumerate(PROJECT_STATUS_OPTIONS)}
+TASK_STATUS_OPTIONS = ("Not Started", "In Progress", "Blocked", "Completed")
+TASK_STATUS_INDEX = {v: i for i, v in enumerate(TASK_STATUS_OPTIONS)}
+PRIORITY_OPTIONS = ("Low", "Medium", "High")
+PRIORITY_INDEX = {v: i for i, v in enumerate(PRIORITY_OPTIONS)}
+
+# Create tables if they don't exist
+def _create_tables(conn):
     c = conn.cursor()
     
-    # Create tables if they don't exist
     c.execute('''
     CREATE TABLE IF NOT EXISTS projects (
         id INTEGER PRIMARY KEY,
@@ -60,19 +69,256 @@ def init_db():
     )
     ''')
     
+    # Indexes backing the task joins/filters and the project name filter:
+    # - idx_tasks_project_status serves per-project task lookups and the
+    #   per-project completed/total counts
+    # - idx_tasks_project_stats covers the timeline stats query (both the
+    #   aggregate and the longest-task subquery read only the index)
+    # - idx_tasks_status serves the Tasks page status filter
+    # - idx_tasks_open_due is partial so the dashboard's open-and-due-soon query
+    #   seeks on due_date and returns rows already in due_date order
+    c.executescript('''
+    CREATE INDEX IF NOT EXISTS idx_tasks_project_status ON tasks(project_id, status);
+    CREATE INDEX IF NOT EXISTS idx_tasks_project_stats ON tasks(project_id, due_date, start_date, status, name);
+    CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks(assigned_to);
+    CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+    CREATE INDEX IF NOT EXISTS idx_tasks_open_due ON tasks(due_date) WHERE status <> 'Completed';
+    CREATE INDEX IF NOT EXISTS idx_projects_name ON projects(name);
+    ''')
+    
     conn.commit()
+
+# Initialize database: one connection per server process, shared across reruns
+# so SQLite's page cache stays warm and the DDL runs only once.
+@st.cache_resource
+def get_conn():
+    conn = sqlite3.connect(str(DB_PATH), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA mmap_size=268435456;
+        PRAGMA cache_size=-65536;
+    """)
+    _create_tables(conn)
+    return conn
+
+# Every session thread shares the writer connection above, so transactions
+# on it are serialized through one process-wide lock
+@st.cache_resource
+def _write_lock():
+    return threading.Lock()
+
+@contextmanager
+def write_transaction(conn):
+    with _write_lock(), conn:
+        yield conn
+
+# Long-lived read-only connection for the cached reads. Under WAL it never
+# blocks on (or blocks) the writer connection above.
+@st.cache_resource
+def get_reader():
+    get_conn()  # make sure the database file and tables exist
+    conn = sqlite3.connect(DB_PATH.resolve().as_uri() + "?mode=ro", uri=True, check_same_thread=False)
+    conn.executescript("""
+        PRAGMA query_only=1;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA mmap_size=268435456;
+        PRAGMA cache_size=-65536;
+    """)
     return conn
 
+# Process-wide data version. Every session reads and bumps the same counter,
+# so a save invalidates the cached reads below for all sessions at once.
+@st.cache_resource
+def _db_version_state():
+    return {'value': 0, 'lock': threading.Lock()}
+
+def db_version():
+    return _db_version_state()['value']
+
+def bump_db_version():
+    state = _db_version_state()
+    with state['lock']:
+        state['value'] += 1
+
+# Cached reads, keyed on the query and the current db_version so any save
+# invalidates them
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_read_sql(query, params, version):
+    return pd.read_sql(query, get_reader(), params=params)
+
+def query_df(query, params=()):
+    return _cached_read_sql(query, tuple(params), db_version())
+
+# One project's record, plus its start/end dates parsed to datetime64[D] as
+# start_day/end_day
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_project(project_id, version):
+    c = get_reader().cursor()
+    c.row_factory = sqlite3.Row
+    project = dict(c.execute("SELECT * FROM projects WHERE id = ?", (project_id,)).fetchone())
+    project['start_day'] = np.datetime64(project['start_date'], 'D')
+    project['end_day'] = np.datetime64(project['end_date'], 'D')
+    return project
+
+def load_project(project_id):
+    return _cached_project(project_id, db_version())
+
+# Tasks of one project with their dates already parsed for plotting
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_project_tasks(project_id, version):
+    tasks_df = pd.read_sql("""
+        SELECT t.*, tm.name as assignee_name 
+        FROM tasks t 
+        LEFT JOIN team_members tm ON t.assigned_to = tm.id
+        WHERE t.project_id = ?
+    """, get_reader(), params=(project_id,))
+    tasks_df['start_date'] = pd.to_datetime(tasks_df['start_date'], format='%Y-%m-%d')
+    tasks_df['due_date'] = pd.to_datetime(tasks_df['due_date'], format='%Y-%m-%d')
+    return tasks_df
+
+def load_project_tasks(project_id):
+    return _cached_project_tasks(project_id, db_version())
+
+# Completed/total task counts plus the longest task's length and name for one
+# project, aggregated in SQLite in one round-trip
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_task_stats(project_id, version):
+    return get_reader().execute("""
+        SELECT SUM(status = 'Completed') AS completed,
+               COUNT(*) AS total,
+               CAST(MAX(julianday(due_date) - julianday(start_date)) AS INTEGER) AS longest_days,
+               (SELECT name FROM tasks
+                WHERE project_id = ?
+                ORDER BY julianday(due_date) - julianday(start_date) DESC, id
+                LIMIT 1) AS critical_task
+        FROM tasks
+        WHERE project_id = ?
+    """, (project_id, project_id)).fetchone()
+
+def load_task_stats(project_id):
+    return _cached_task_stats(project_id, db_version())
+
+# Cached (id, name) pairs for selectbox options; a plain fetchall is much
+# cheaper than building a DataFrame for a two-column lookup
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_id_names(table, version):
+    return get_reader().execute(f"SELECT id, name FROM {table} ORDER BY name").fetchall()
+
+def id_name_options(table):
+    rows = _cached_id_names(table, db_version())
+    return [row[0] for row in rows], [row[1] for row in rows]
+
+# Insert or update projects in a single transaction. Rows are
+# (id, name, description, start_date, end_date, status, progress); a None id inserts.
+def bulk_upsert_projects(conn, rows):
+    with write_transaction(conn):
+        conn.executemany('''
+        INSERT INTO projects (id, name, description, start_date, end_date, status, progress)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            name = excluded.name,
+            description = excluded.description,
+            start_date = excluded.start_date,
+            end_date = excluded.end_date,
+            status = excluded.status,
+            progress = excluded.progress
+        ''', rows)
+
+# Plotted rows as a hashable tuple, used to key the cached chart builders
+def as_rows(df):
+    return tuple(df.itertuples(index=False, name=None))
+
+# Cached chart builders: unchanged data reuses the already-built figure.
+# Plotly is imported on first use so pages without charts never load it.
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def status_pie_fig(rows, hole=None, title=None):
+    import plotly.express as px
+    status_counts = pd.DataFrame(rows, columns=['Status', 'Count'])
+    return px.pie(status_counts, values='Count', names='Status', hole=hole, title=title)
+
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def progress_bar_fig(rows, color, title=None):
+    import plotly.express as px
+    projects_df = pd.DataFrame(rows, columns=['name', 'progress', 'status'])
+    fig = px.bar(projects_df, x='name', y='progress',
+                 labels={'name': 'Project', 'progress': 'Progress (%)'},
+                 color=color,
+                 color_continuous_scale='Viridis',
+                 title=title)
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def workload_bar_fig(rows):
+    import plotly.express as px
+    task_counts = pd.DataFrame(rows, columns=['Team Member', 'Tasks Assigned'])
+    return px.bar(task_counts, x='Team Member', y='Tasks Assigned',
+                  title="Tasks Assigned per Team Member")
+
+@st.cache_data(ttl=60, max_entries=32, show_spinner=False)
+def workload_status_fig(rows):
+    import plotly.express as px
+    status_counts = pd.DataFrame(rows, columns=['assignee_name', 'status', 'n'])
+    return px.bar(status_counts, x='assignee_name', y='n', color='status',
+                  title="Task Status by Team Member",
+                  labels={'assignee_name': 'Team Member', 'n': 'Number of Tasks'})
+
+# The timeline is the largest figure, so it is kept as a shared resource rather
+# than pickled per hit: reruns skip the build and an unpickle. st.plotly_chart
+# still converts and JSON-encodes the figure on every render.
+@st.cache_resource(show_spinner=False, max_entries=32)
+def timeline_fig(rows):
+    # Built directly as one horizontal go.Bar per status (what px.timeline
+    # produces) to skip plotly.express's DataFrame introspection
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+    tasks, starts, finishes, statuses, assignees = (np.array(col) for col in zip(*rows))
+    starts = starts.astype('datetime64[ms]')
+    finishes = finishes.astype('datetime64[ms]')
+    durations = (finishes - starts).astype(np.int64)
+    finish_labels = np.datetime_as_string(finishes, unit='D')
+    
+    fig = go.Figure()
+    for i, status in enumerate(dict.fromkeys(statuses)):
+        in_status = statuses == status
+        fig.add_trace(go.Bar(
+            base=starts[in_status],
+            x=durations[in_status],
+            y=tasks[in_status],
+            orientation='h',
+            name=status,
+            marker_color=qualitative.Plotly[i % len(qualitative.Plotly)],
+            customdata=np.column_stack((finish_labels[in_status], assignees[in_status])),
+            hovertemplate="Task=%{y}<br>Start=%{base|%Y-%m-%d}<br>Finish=%{customdata[0]}"
+                          "<br>Assignee=%{customdata[1]}<extra>%{fullData.name}</extra>"
+        ))
+    fig.update_layout(title="Project Task Timeline", barmode='overlay', xaxis_type='date',
+                      yaxis_title="Task", legend_title_text="Status")
+    return fig
+
+# Session state defaults
+_SESSION_DEFAULTS = (
+    ('page', 'Dashboard'),
+    ('edit_project', None),
+    ('edit_task', None),
+    ('edit_team_member', None),
+)
+
 # Initialize session state
 def init_session_state():
-    if 'page' not in st.session_state:
-        st.session_state['page'] = 'Dashboard'
-    if 'edit_project' not in st.session_state:
-        st.session_state['edit_project'] = None
-    if 'edit_task' not in st.session_state:
-        st.session_state['edit_task'] = None
-    if 'edit_team_member' not in st.session_state:
-        st.session_state['edit_team_member'] = None
+    session_state = st.session_state
+    for key, value in _SESSION_DEFAULTS:
+        session_state.setdefault(key, value)
+
+# Edit-state session key owned by each page
+EDIT_STATE_KEYS = {
+    'Projects': 'edit_project',
+    'Tasks': 'edit_task',
+    'Team': 'edit_team_member',
+}
 
 # Navigation
 def sidebar_navigation():
@@ -86,13 +332,10 @@ def sidebar_navigation():
         for i, option in enumerate(nav_options):
             if st.button(f"{icons[i]} {option}"):
                 st.session_state['page'] = option
-        # Reset edit states when changing pages
-                if option != "Projects":
-                    st.session_state['edit_project'] = None
-                if option != "Tasks":
-                    st.session_state['edit_task'] = None
-                if option != "Team":
-                    st.session_state['edit_team_member'] = None
+                # Reset edit states of the other pages
+                for page, key in EDIT_STATE_KEYS.items():
+                    if page != option:
+                        st.session_state[key] = None
         
         st.divider()
         st.markdown("### Quick Actions")
@@ -103,30 +346,36 @@ def sidebar_navigation():
             st.session_state['page'] = "Tasks"
             st.session_state['edit_task'] = "new"
 
+# Overview metrics computed directly on the underlying NumPy arrays, without
+# building masked sub-DataFrames
+def overview_metrics(project_progress, task_status):
+    avg_progress = project_progress.mean() if project_progress.size else 0
+    open_tasks = int(np.count_nonzero(task_status != 'Completed'))
+    return avg_progress, open_tasks
+
 # Dashboard page
+@st.fragment
 def dashboard_page(conn):
     st.title("Dashboard 📊")
     
     # Get data for dashboard
-    projects_df = pd.read_sql("SELECT * FROM projects", conn)
-    tasks_df = pd.read_sql("SELECT * FROM tasks", conn)
-    team_df = pd.read_sql("SELECT * FROM team_members", conn)
+    projects_df = query_df("SELECT * FROM projects")
+    tasks_df = query_df("SELECT * FROM tasks")
+    team_df = query_df("SELECT * FROM team_members")
     
     # Overview metrics
+    avg_progress, open_tasks = overview_metrics(projects_df['progress'].to_numpy(dtype=float),
+                                                tasks_df['status'].to_numpy())
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric("Total Projects", len(projects_df))
     with col2:
-        st.metric("Open Tasks", len(tasks_df[tasks_df['status'] != 'Completed']))
+        st.metric("Open Tasks", open_tasks)
     with col3:
         st.metric("Team Members", len(team_df))
     with col4:
-        if not projects_df.empty:
-            avg_progress = projects_df['progress'].mean()
-            st.metric("Avg. Project Progress", f"{avg_progress:.0f}%")
-        else:
-            st.metric("Avg. Project Progress", "0%")
+        st.metric("Avg. Project Progress", f"{avg_progress:.0f}%")
     
     # Project status and progress
     if not projects_df.empty:
@@ -134,18 +383,18 @@ def dashboard_page(conn):
         
         with col1:
             st.subheader("Project Status")
-            status_counts = projects_df['status'].value_counts().reset_index()
-            status_counts.columns = ['Status', 'Count']
-            fig = px.pie(status_counts, values='Count', names='Status', hole=.3)
+            status_counts = query_df("""
+                SELECT status AS Status, COUNT(*) AS Count
+                FROM projects
+                GROUP BY status
+                ORDER BY Count DESC
+            """)
+            fig = status_pie_fig(as_rows(status_counts), hole=.3)
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.subheader("Project Progress")
-            fig = px.bar(projects_df, x='name', y='progress', 
-                         labels={'name': 'Project', 'progress': 'Progress (%)'},
-                         color='progress',
-                         color_continuous_scale='Viridis')
-            fig.update_layout(xaxis_tickangle=-45)
+            fig = progress_bar_fig(as_rows(projects_df[['name', 'progress', 'status']]), color='progress')
             st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No projects found. Add a project to see statistics here.")
@@ -154,46 +403,37 @@ def dashboard_page(conn):
     if not tasks_df.empty:
         st.subheader("Tasks Due Soon")
         
-        # Convert date strings to datetime objects for comparison
-        tasks_df['due_date'] = pd.to_datetime(tasks_df['due_date'])
-        
-        # Filter tasks that are not completed and due within the next 7 days
-        today = datetime.datetime.now()
-        upcoming_tasks = tasks_df[(tasks_df['status'] != 'Completed') & 
-                                (tasks_df['due_date'] <= today + datetime.timedelta(days=7))]
+        # Tasks that are not completed and due within the next 7 days, with project names
+        due_by = datetime.date.today() + datetime.timedelta(days=7)
+        display_tasks = query_df("""
+            SELECT t.name AS "Task", p.name AS "Project", t.status AS "Status",
+                   t.priority AS "Priority", t.due_date AS "Due Date"
+            FROM tasks t
+            JOIN projects p ON t.project_id = p.id
+            WHERE t.status <> 'Completed' AND t.due_date <= ?
+            ORDER BY t.due_date
+        """, (due_by.isoformat(),))
         
-        if not upcoming_tasks.empty:
-            upcoming_tasks = upcoming_tasks.sort_values('due_date')
-            
-            # Join with project data to show project name
-            projects_minimal = pd.read_sql("SELECT id, name FROM projects", conn)
-            upcoming_tasks = upcoming_tasks.merge(projects_minimal, left_on='project_id', right_on='id', suffixes=('', '_project'))
-            
-            # Format for display
-            display_tasks = upcoming_tasks[['name', 'name_project', 'status', 'priority', 'due_date']]
-            display_tasks.columns = ['Task', 'Project', 'Status', 'Priority', 'Due Date']
-            
+        if not display_tasks.empty:
             # Color code by priority
-            def color_priority(val):
-                if val == 'High':
-                    return 'background-color: #FFCCCC'
-                elif val == 'Medium':
-                    return 'background-color: #FFFFCC'
-                return ''
+            def color_priority(col):
+                return np.where(col == 'High', 'background-color: #FFCCCC',
+                                np.where(col == 'Medium', 'background-color: #FFFFCC', ''))
             
-            st.dataframe(display_tasks.style.applymap(color_priority, subset=['Priority']), use_container_width=True)
+            st.dataframe(display_tasks.style.apply(color_priority, subset=['Priority']), use_container_width=True)
         else:
             st.info("No upcoming deadlines in the next 7 days.")
     else:
         st.info("No tasks found. Add tasks to see upcoming deadlines.")
 
 # Projects page
+@st.fragment
 def projects_page(conn):
     st.title("Projects 🚀")
     
     if st.session_state['edit_project'] is None:
         # Display existing projects
-        projects_df = pd.read_sql("SELECT * FROM projects", conn)
+        projects_df = query_df("SELECT * FROM projects")
         
         col1, col2 = st.columns([3, 1])
         with col2:
@@ -202,27 +442,32 @@ def projects_page(conn):
                 st.rerun()
         
         if not projects_df.empty:
-            for index, project in projects_df.iterrows():
-                with st.expander(f"{project['name']} - {project['status']} ({project['progress']}%)"):
+            # Task counts for every project in a single query
+            task_counts = query_df("""
+                SELECT project_id, SUM(status = 'Completed') AS completed, COUNT(*) AS total
+                FROM tasks
+                GROUP BY project_id
+            """).set_index('project_id')
+            
+            for project in projects_df.itertuples(index=False):
+                with st.expander(f"{project.name} - {project.status} ({project.progress}%)"):
                     col1, col2, col3 = st.columns([3, 1, 1])
                     with col1:
-                        st.write(f"**Description:** {project['description']}")
-                        st.write(f"**Timeline:** {project['start_date']} to {project['end_date']}")
+                        st.write(f"**Description:** {project.description}")
+                        st.write(f"**Timeline:** {project.start_date} to {project.end_date}")
                         
-                        # Get tasks for this project
-                        tasks_df = pd.read_sql(f"SELECT * FROM tasks WHERE project_id = {project['id']}", conn)
-                        if not tasks_df.empty:
-                            completed_tasks = len(tasks_df[tasks_df['status'] == 'Completed'])
-                            st.write(f"**Tasks:** {completed_tasks}/{len(tasks_df)} completed")
+                        if project.id in task_counts.index:
+                            counts = task_counts.loc[project.id]
+                            st.write(f"**Tasks:** {counts['completed']}/{counts['total']} completed")
                         else:
                             st.write("**Tasks:** No tasks assigned")
                     
                     with col2:
-                        st.progress(project['progress'] / 100)
+                        st.progress(project.progress / 100)
                     
                     with col3:
-                        if st.button("Edit", key=f"edit_{project['id']}"):
-                            st.session_state['edit_project'] = project['id']
+                        if st.button("Edit", key=f"edit_{project.id}"):
+                            st.session_state['edit_project'] = project.id
                             st.rerun()
         else:
             st.info("No projects found. Create a new project to get started.")
@@ -241,9 +486,7 @@ def projects_page(conn):
             }
         else:
             st.subheader("Edit Project")
-            c = conn.cursor()
-            c.execute("SELECT * FROM projects WHERE id = ?", (st.session_state['edit_project'],))
-            project_data = dict(zip([column[0] for column in c.description], c.fetchone()))
+            project_data = dict(conn.execute("SELECT * FROM projects WHERE id = ?", (st.session_state['edit_project'],)).fetchone())
         
         with st.form("project_form"):
             name = st.text_input("Project Name", value=project_data['name'])
@@ -257,9 +500,8 @@ def projects_page(conn):
             
             col1, col2 = st.columns(2)
             with col1:
-                status = st.selectbox("Status", 
-                                     ["Planning", "In Progress", "On Hold", "Completed", "Cancelled"],
-                                     index=["Planning", "In Progress", "On Hold", "Completed", "Cancelled"].index(project_data['status']))
+                status = st.selectbox("Status", PROJECT_STATUS_OPTIONS,
+                                     index=PROJECT_STATUS_INDEX.get(project_data['status'], 0))
             with col2:
                 progress = st.slider("Progress (%)", 0, 100, int(project_data['progress']))
             
@@ -273,20 +515,9 @@ def projects_page(conn):
             
             if submit:
                 if name:
-                    c = conn.cursor()
-                    if project_data['id'] is None:
-                        c.execute('''
-                        INSERT INTO projects (name, description, start_date, end_date, status, progress)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                        ''', (name, description, start_date.isoformat(), end_date.isoformat(), status, progress))
-                    else:
-                        c.execute('''
-                        UPDATE projects
-                        SET name = ?, description = ?, start_date = ?, end_date = ?, status = ?, progress = ?
-                        WHERE id = ?
-                        ''', (name, description, start_date.isoformat(), end_date.isoformat(), status, progress, project_data['id']))
-                    
-                    conn.commit()
+                    bulk_upsert_projects(conn, [(project_data['id'], name, description, start_date.isoformat(),
+                                                 end_date.isoformat(), status, progress)])
+                    bump_db_version()
                     st.session_state['edit_project'] = None
                     st.success("Project saved successfully!")
                     st.rerun()
@@ -294,6 +525,7 @@ def projects_page(conn):
                     st.error("Project name is required.")
 
 # Tasks page
+@st.fragment
 def tasks_page(conn):
     st.title("Tasks ✅")
     
@@ -303,12 +535,12 @@ def tasks_page(conn):
         
         with col1:
             # Get all projects for filter
-            projects_df = pd.read_sql("SELECT id, name FROM projects", conn)
-            project_options = ["All Projects"] + projects_df['name'].tolist()
+            _, project_names = id_name_options('projects')
+            project_options = ["All Projects"] + project_names
             selected_project = st.selectbox("Filter by Project", project_options)
         
         with col2:
-            status_options = ["All Statuses", "Not Started", "In Progress", "Blocked", "Completed"]
+            status_options = ("All Statuses",) + TASK_STATUS_OPTIONS
             selected_status = st.selectbox("Filter by Status", status_options)
         
         with col3:
@@ -333,28 +565,28 @@ def tasks_page(conn):
             query += " WHERE " + " AND ".join(where_clauses)
         
         # Get filtered tasks
-        tasks_df = pd.read_sql(query, conn, params=params)
+        tasks_df = query_df(query, params)
         
         if not tasks_df.empty:
             # Display tasks in a nice format
-            for index, task in tasks_df.iterrows():
-                with st.expander(f"{task['name']} - {task['status']} ({task['progress']}%)"):
+            for task in tasks_df.itertuples(index=False):
+                with st.expander(f"{task.name} - {task.status} ({task.progress}%)"):
                     col1, col2 = st.columns([3, 1])
                     
                     with col1:
-                        st.write(f"**Project:** {task['project_name']}")
-                        st.write(f"**Description:** {task['description']}")
-                        st.write(f"**Priority:** {task['priority']}")
-                        st.write(f"**Timeline:** {task['start_date']} to {task['due_date']}")
-                        if task['assignee_name']:
-                            st.write(f"**Assigned to:** {task['assignee_name']}")
+                        st.write(f"**Project:** {task.project_name}")
+                        st.write(f"**Description:** {task.description}")
+                        st.write(f"**Priority:** {task.priority}")
+                        st.write(f"**Timeline:** {task.start_date} to {task.due_date}")
+                        if task.assignee_name:
+                            st.write(f"**Assigned to:** {task.assignee_name}")
                         else:
                             st.write("**Assigned to:** Unassigned")
                     
                     with col2:
-                        st.progress(task['progress'] / 100)
-                        if st.button("Edit", key=f"edit_task_{task['id']}"):
-                            st.session_state['edit_task'] = task['id']
+                        st.progress(task.progress / 100)
+                        if st.button("Edit", key=f"edit_task_{task.id}"):
+                            st.session_state['edit_task'] = task.id
                             st.rerun()
         else:
             st.info("No tasks found with the selected filters.")
@@ -377,25 +609,21 @@ def tasks_page(conn):
             }
         else:
             st.subheader("Edit Task")
-            c = conn.cursor()
-            c.execute("SELECT * FROM tasks WHERE id = ?", (st.session_state['edit_task'],))
-            task_data = dict(zip([column[0] for column in c.description], c.fetchone()))
+            task_data = dict(conn.execute("SELECT * FROM tasks WHERE id = ?", (st.session_state['edit_task'],)).fetchone())
         
         with st.form("task_form"):
             # Get project options
-            projects_df = pd.read_sql("SELECT id, name FROM projects", conn)
-            project_options = projects_df['name'].tolist()
-            project_ids = projects_df['id'].tolist()
+            project_ids, project_options = id_name_options('projects')
             
             # Get team member options
-            team_df = pd.read_sql("SELECT id, name FROM team_members", conn)
-            team_options = ["Unassigned"] + team_df['name'].tolist()
-            team_ids = [None] + team_df['id'].tolist()
+            member_ids, member_names = id_name_options('team_members')
+            team_options = ["Unassigned"] + member_names
+            team_ids = [None] + member_ids
             
             name = st.text_input("Task Name", value=task_data['name'])
             
             # Project selection
-            if projects_df.empty:
+            if not project_ids:
                 st.error("You need to create a project before adding tasks.")
                 project_idx = 0
             else:
@@ -415,16 +643,14 @@ def tasks_page(conn):
             
             col1, col2 = st.columns(2)
             with col1:
-                status = st.selectbox("Status", 
-                                     ["Not Started", "In Progress", "Blocked", "Completed"],
-                                     index=["Not Started", "In Progress", "Blocked", "Completed"].index(task_data['status']))
+                status = st.selectbox("Status", TASK_STATUS_OPTIONS,
+                                     index=TASK_STATUS_INDEX.get(task_data['status'], 0))
             with col2:
-                priority = st.selectbox("Priority",
-                                       ["Low", "Medium", "High"],
-                                       index=["Low", "Medium", "High"].index(task_data['priority']))
+                priority = st.selectbox("Priority", PRIORITY_OPTIONS,
+                                       index=PRIORITY_INDEX.get(task_data['priority'], 0))
             
             # Team member assignment
-            if team_df.empty:
+            if not member_ids:
                 st.warning("No team members available. You can add team members in the Team section.")
                 assigned_idx = 0
             else:
@@ -448,42 +674,42 @@ def tasks_page(conn):
                     st.rerun()
             
             if submit:
-                if name and not projects_df.empty:
-                    c = conn.cursor()
-                    
+                if name and project_ids:
                     # Get IDs for the selected options
                     project_id = project_ids[project_options.index(project_idx)]
-                    assigned_to = None if assigned_idx == "Unassigned" or team_df.empty else team_ids[team_options.index(assigned_idx)]
+                    assigned_to = None if assigned_idx == "Unassigned" or not member_ids else team_ids[team_options.index(assigned_idx)]
                     
-                    if task_data['id'] is None:
-                        c.execute('''
-                        INSERT INTO tasks (project_id, name, description, status, priority, start_date, due_date, assigned_to, progress)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (project_id, name, description, status, priority, start_date.isoformat(), due_date.isoformat(), assigned_to, progress))
-                    else:
-                        c.execute('''
-                        UPDATE tasks
-                        SET project_id = ?, name = ?, description = ?, status = ?, priority = ?, start_date = ?, due_date = ?, assigned_to = ?, progress = ?
-                        WHERE id = ?
-                        ''', (project_id, name, description, status, priority, start_date.isoformat(), due_date.isoformat(), assigned_to, progress, task_data['id']))
-                    
-                    conn.commit()
+                    with write_transaction(conn):
+                        c = conn.cursor()
+                        if task_data['id'] is None:
+                            c.execute('''
+                            INSERT INTO tasks (project_id, name, description, status, priority, start_date, due_date, assigned_to, progress)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            ''', (project_id, name, description, status, priority, start_date.isoformat(), due_date.isoformat(), assigned_to, progress))
+                        else:
+                            c.execute('''
+                            UPDATE tasks
+                            SET project_id = ?, name = ?, description = ?, status = ?, priority = ?, start_date = ?, due_date = ?, assigned_to = ?, progress = ?
+                            WHERE id = ?
+                            ''', (project_id, name, description, status, priority, start_date.isoformat(), due_date.isoformat(), assigned_to, progress, task_data['id']))
+                    bump_db_version()
                     st.session_state['edit_task'] = None
                     st.success("Task saved successfully!")
                     st.rerun()
                 else:
-                    if projects_df.empty:
+                    if not project_ids:
                         st.error("You need to create a project before adding tasks.")
                     else:
                         st.error("Task name is required.")
 
 # Team page
+@st.fragment
 def team_page(conn):
     st.title("Team 👥")
     
     if st.session_state['edit_team_member'] is None:
         # Display team members
-        team_df = pd.read_sql("SELECT * FROM team_members", conn)
+        team_df = query_df("SELECT * FROM team_members")
         
         col1, col2 = st.columns([3, 1])
         with col2:
@@ -494,20 +720,28 @@ def team_page(conn):
         if not team_df.empty:
             # Display in a grid layout
             cols = st.columns(3)
-            for index, member in team_df.iterrows():
+            
+            # Assigned task counts for every member in a single query
+            assigned_counts = query_df("""
+                SELECT assigned_to, COUNT(*) AS count
+                FROM tasks
+                WHERE assigned_to IS NOT NULL
+                GROUP BY assigned_to
+            """).set_index('assigned_to')['count']
+            
+            for index, member in enumerate(team_df.itertuples(index=False)):
                 with cols[index % 3]:
                     with st.container(border=True):
-                        st.subheader(member['name'])
-                        st.write(f"**Role:** {member['role']}")
-                        if member['email']:
-                            st.write(f"**Email:** {member['email']}")
+                        st.subheader(member.name)
+                        st.write(f"**Role:** {member.role}")
+                        if member.email:
+                            st.write(f"**Email:** {member.email}")
                         
-                        # Get tasks assigned to this team member
-                        tasks_count = pd.read_sql(f"SELECT COUNT(*) as count FROM tasks WHERE assigned_to = {member['id']}", conn).iloc[0]['count']
+                        tasks_count = assigned_counts.get(member.id, 0)
                         st.write(f"**Assigned Tasks:** {tasks_count}")
                         
-                        if st.button("Edit", key=f"edit_member_{member['id']}"):
-                            st.session_state['edit_team_member'] = member['id']
+                        if st.button("Edit", key=f"edit_member_{member.id}"):
+                            st.session_state['edit_team_member'] = member.id
                             st.rerun()
         else:
             st.info("No team members found. Add team members to assign tasks.")
@@ -523,9 +757,7 @@ def team_page(conn):
             }
         else:
             st.subheader("Edit Team Member")
-            c = conn.cursor()
-            c.execute("SELECT * FROM team_members WHERE id = ?", (st.session_state['edit_team_member'],))
-            member_data = dict(zip([column[0] for column in c.description], c.fetchone()))
+            member_data = dict(conn.execute("SELECT * FROM team_members WHERE id = ?", (st.session_state['edit_team_member'],)).fetchone())
         
         with st.form("team_member_form"):
             name = st.text_input("Name", value=member_data['name'])
@@ -542,182 +774,184 @@ def team_page(conn):
             
             if submit:
                 if name and role:
-                    c = conn.cursor()
-                    if member_data['id'] is None:
-                        c.execute('''
-                        INSERT INTO team_members (name, role, email)
-                        VALUES (?, ?, ?)
-                        ''', (name, role, email))
-                    else:
-                        c.execute('''
-                        UPDATE team_members
-                        SET name = ?, role = ?, email = ?
-                        WHERE id = ?
-                        ''', (name, role, email, member_data['id']))
-                    
-                    conn.commit()
+                    with write_transaction(conn):
+                        c = conn.cursor()
+                        if member_data['id'] is None:
+                            c.execute('''
+                            INSERT INTO team_members (name, role, email)
+                            VALUES (?, ?, ?)
+                            ''', (name, role, email))
+                        else:
+                            c.execute('''
+                            UPDATE team_members
+                            SET name = ?, role = ?, email = ?
+                            WHERE id = ?
+                            ''', (name, role, email, member_data['id']))
+                    bump_db_version()
                     st.session_state['edit_team_member'] = None
                     st.success("Team member saved successfully!")
                     st.rerun()
                 else:
                     st.error("Name and role are required.")
 
+# Project progress report
+@st.fragment
+def project_progress_report():
+    st.subheader("Project Progress Overview")
+    
+    # Get projects data
+    projects_df = query_df("SELECT * FROM projects")
+    
+    if not projects_df.empty:
+        # Progress by project
+        fig = progress_bar_fig(as_rows(projects_df[['name', 'progress', 'status']]), color='status',
+                               title="Project Progress")
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Project status breakdown
+        status_counts = query_df("""
+            SELECT status AS Status, COUNT(*) AS Count
+            FROM projects
+            GROUP BY status
+            ORDER BY Count DESC
+        """)
+        fig = status_pie_fig(as_rows(status_counts), title="Project Status Distribution")
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No projects data available for reporting.")
+
+# Team workload report
+@st.fragment
+def team_workload_report():
+    st.subheader("Team Workload Analysis")
+    
+    # Assigned task counts per team member and status
+    member_status_counts = query_df("""
+        SELECT tm.name AS assignee_name, t.status, COUNT(*) AS n
+        FROM tasks t
+        JOIN team_members tm ON t.assigned_to = tm.id
+        GROUP BY tm.name, t.status
+    """)
+    
+    if not member_status_counts.empty:
+        # Task count by team member
+        task_counts = member_status_counts.groupby('assignee_name', sort=True)['n'].sum().reset_index()
+        fig = workload_bar_fig(as_rows(task_counts))
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Task status breakdown by team member
+        fig = workload_status_fig(as_rows(member_status_counts))
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No tasks have been assigned to team members yet.")
+
+# Gantt chart, critical path and completion estimate for one project, in its
+# own fragment so reruns elsewhere on the Timeline tab don't redraw it
+@st.fragment
+def timeline_analysis(project_id, project_details, task_stats):
+    completed_tasks_count, total_tasks, longest_days, critical_task_name = task_stats
+    
+    # The task rows are only loaded and charted when the Gantt chart is shown
+    if st.toggle("Show task timeline", key=f"show_timeline_{project_id}"):
+        # Prepare data for Gantt chart
+        tasks_df = load_project_tasks(project_id)
+        gantt_df = pd.DataFrame({
+            'Task': tasks_df['name'].to_numpy(),
+            'Start': tasks_df['start_date'].to_numpy(),
+            'Finish': tasks_df['due_date'].to_numpy(),
+            'Status': tasks_df['status'].to_numpy(),
+            'Assignee': tasks_df['assignee_name'].fillna('Unassigned').to_numpy()
+        }, copy=False)
+        
+        # Create Gantt chart
+        fig = timeline_fig(as_rows(gantt_df))
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Critical path (simplified - just showing the longest task)
+    st.subheader("Critical Path Analysis")
+    st.write(f"Longest task duration: **{longest_days} days** - *{critical_task_name}*")
+    
+    # Task completion prediction
+    completion_percentage = (completed_tasks_count / total_tasks) * 100 if total_tasks > 0 else 0
+    
+    st.write(f"Task completion: **{completed_tasks_count}/{total_tasks}** tasks completed ({completion_percentage:.1f}%)")
+    
+    # Calculate expected completion date based on progress
+    if completed_tasks_count > 0:
+        project_start = project_details['start_day']
+        project_end = project_details['end_day']
+        planned_days = (project_end - project_start) // np.timedelta64(1, 'D')
+        
+        days_passed = (np.datetime64(datetime.date.today(), 'D') - project_start) // np.timedelta64(1, 'D')
+        estimated_total_days = days_passed * total_tasks / completed_tasks_count
+        days_late = estimated_total_days - planned_days
+        
+        if days_late > 0:
+            st.warning(f"Based on current progress, this project may finish **{int(days_late)} days late**.")
+        else:
+            st.success(f"Based on current progress, this project is on track to finish on time.")
+
+# Timeline report
+@st.fragment
+def timeline_report():
+    st.subheader("Project Timeline")
+    
+    # Get projects for selection
+    project_ids, project_names = id_name_options('projects')
+    
+    if project_ids:
+        selected_project = st.selectbox("Select Project", project_names)
+        project_id = project_ids[project_names.index(selected_project)]
+        
+        # Get project details
+        project_details = load_project(project_id)
+        
+        # Task counts and longest task for this project
+        task_stats = load_task_stats(project_id)
+        
+        # Display project timeline
+        st.write(f"**Project Duration:** {project_details['start_date']} to {project_details['end_date']}")
+        st.write(f"**Status:** {project_details['status']}")
+        st.write(f"**Overall Progress:** {project_details['progress']}%")
+        
+        if task_stats[1] > 0:
+            timeline_analysis(project_id, project_details, task_stats)
+        else:
+            st.info("No tasks found for this project. Add tasks to see timeline analysis.")
+    else:
+        st.info("No projects found. Create a project to view timeline reports.")
+
 # Reports page
+@st.fragment
 def reports_page(conn):
     st.title("Reports 📈")
     
-    # Tab for different reports
+    # Tab for different reports; each renders in its own fragment so its
+    # widgets only rerun that tab
     tab1, tab2, tab3 = st.tabs(["Project Progress", "Team Workload", "Timeline"])
     
     with tab1:
-        st.subheader("Project Progress Overview")
-        
-        # Get projects data
-        projects_df = pd.read_sql("SELECT * FROM projects", conn)
-        
-        if not projects_df.empty:
-            # Progress by project
-            fig = px.bar(projects_df, x='name', y='progress',
-                        labels={'name': 'Project', 'progress': 'Progress (%)'},
-                        color='status',
-                        title="Project Progress")
-            fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Project status breakdown
-            status_counts = projects_df['status'].value_counts().reset_index()
-            status_counts.columns = ['Status', 'Count']
-            fig = px.pie(status_counts, values='Count', names='Status', 
-                        title="Project Status Distribution")
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No projects data available for reporting.")
+        project_progress_report()
     
     with tab2:
-        st.subheader("Team Workload Analysis")
-        
-        # Get team and task data
-        team_df = pd.read_sql("SELECT id, name, role FROM team_members", conn)
-        tasks_df = pd.read_sql("""
-            SELECT t.*, tm.name as assignee_name, p.name as project_name 
-            FROM tasks t 
-            LEFT JOIN team_members tm ON t.assigned_to = tm.id
-            LEFT JOIN projects p ON t.project_id = p.id
-        """, conn)
-        
-        if not team_df.empty and not tasks_df.empty:
-            # Task count by team member
-            task_counts = tasks_df.groupby('assignee_name').size().reset_index()
-            task_counts.columns = ['Team Member', 'Tasks Assigned']
-            # Remove None/Unassigned
-            task_counts = task_counts.dropna()
-            
-            if not task_counts.empty:
-                fig = px.bar(task_counts, x='Team Member', y='Tasks Assigned',
-                            title="Tasks Assigned per Team Member")
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Task status breakdown by team member
-                if not tasks_df[tasks_df['assignee_name'].notna()].empty:
-                    fig = px.histogram(tasks_df[tasks_df['assignee_name'].notna()], 
-                                      x='assignee_name', color='status',
-                                      title="Task Status by Team Member",
-                                      labels={'assignee_name': 'Team Member', 'count': 'Number of Tasks'})
-                    st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("No tasks have been assigned to team members yet.")
-        else:
-            st.info("Insufficient data for team workload analysis.")
+        team_workload_report()
     
     with tab3:
-        st.subheader("Project Timeline")
-        
-        # Get projects for selection
-        projects_df = pd.read_sql("SELECT id, name FROM projects", conn)
-        
-        if not projects_df.empty:
-            selected_project = st.selectbox("Select Project", projects_df['name'].tolist())
-            project_id = projects_df[projects_df['name'] == selected_project]['id'].iloc[0]
-            
-            # Get project details
-            project_details = pd.read_sql(f"SELECT * FROM projects WHERE id = {project_id}", conn).iloc[0]
-            
-            # Get tasks for this project
-            tasks_df = pd.read_sql(f"""
-                SELECT t.*, tm.name as assignee_name 
-                FROM tasks t 
-                LEFT JOIN team_members tm ON t.assigned_to = tm.id
-                WHERE t.project_id = {project_id}
-            """, conn)
-            
-            # Display project timeline
-            st.write(f"**Project Duration:** {project_details['start_date']} to {project_details['end_date']}")
-            st.write(f"**Status:** {project_details['status']}")
-            st.write(f"**Overall Progress:** {project_details['progress']}%")
-            
-            if not tasks_df.empty:
-                # Convert dates for plotting
-                tasks_df['start_date'] = pd.to_datetime(tasks_df['start_date'])
-                tasks_df['due_date'] = pd.to_datetime(tasks_df['due_date'])
-                
-                # Prepare data for Gantt chart
-                gantt_data = []
-                for _, task in tasks_df.iterrows():
-                    assignee = task['assignee_name'] if task['assignee_name'] else 'Unassigned'
-                    gantt_data.append({
-                        'Task': task['name'],
-                        'Start': task['start_date'],
-                        'Finish': task['due_date'],
-                        'Status': task['status'],
-                        'Assignee': assignee
-                    })
-                
-                gantt_df = pd.DataFrame(gantt_data)
-                
-                # Create Gantt chart
-                fig = px.timeline(gantt_df, x_start='Start', x_end='Finish', y='Task', color='Status',
-                                hover_data=['Assignee'])
-                fig.update_layout(title="Project Task Timeline")
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Calculate critical path (simplified - just showing the longest tasks)
-                task_durations = (tasks_df['due_date'] - tasks_df['start_date']).dt.days
-                critical_task_idx = task_durations.idxmax()
-                critical_task = tasks_df.iloc[critical_task_idx]
-                
-                st.subheader("Critical Path Analysis")
-                st.write(f"Longest task duration: **{task_durations.max()} days** - *{critical_task['name']}*")
-                
-                # Task completion prediction
-                completed_tasks_count = len(tasks_df[tasks_df['status'] == 'Completed'])
-                total_tasks = len(tasks_df)
-                completion_percentage = (completed_tasks_count / total_tasks) * 100 if total_tasks > 0 else 0
-                
-                st.write(f"Task completion: **{completed_tasks_count}/{total_tasks}** tasks completed ({completion_percentage:.1f}%)")
-                
-                # Calculate expected completion date based on progress
-                if completion_percentage > 0:
-                    project_start = pd.to_datetime(project_details['start_date'])
-                    project_end = pd.to_datetime(project_details['end_date'])
-                    project_duration = (project_end - project_start).days
-                    
-                    days_passed = (datetime.datetime.now() - project_start).days
-                    estimated_total_days = days_passed / (completion_percentage / 100)
-                    estimated_completion = project_start + datetime.timedelta(days=estimated_total_days)
-                    
-                    if estimated_completion > project_end:
-                        st.warning(f"Based on current progress, this project may finish **{(estimated_completion - project_end).days} days late**.")
-                    else:
-                        st.success(f"Based on current progress, this project is on track to finish on time.")
-            else:
-                st.info("No tasks found for this project. Add tasks to see timeline analysis.")
-        else:
-            st.info("No projects found. Create a project to view timeline reports.")
+        timeline_report()
+
+# Page name -> render function
+PAGES = {
+    'Dashboard': dashboard_page,
+    'Projects': projects_page,
+    'Tasks': tasks_page,
+    'Team': team_page,
+    'Reports': reports_page,
+}
 
 # Main app logic
 def main():
-    # Initialize database connection
-    conn = init_db()
+    # Shared database connection
+    conn = get_conn()
     
     # Initialize session state
     init_session_state()
@@ -726,19 +960,7 @@ def main():
     sidebar_navigation()
     
     # Display the selected page
-    if st.session_state['page'] == 'Dashboard':
-        dashboard_page(conn)
-    elif st.session_state['page'] == 'Projects':
-        projects_page(conn)
-    elif st.session_state['page'] == 'Tasks':
-        tasks_page(conn)
-    elif st.session_state['page'] == 'Team':
-        team_page(conn)
-    elif st.session_state['page'] == 'Reports':
-        reports_page(conn)
-    
-    # Close the database connection when done
-    conn.close()
+    PAGES[st.session_state['page']](conn)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file